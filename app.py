@@ -17,23 +17,28 @@ if sys.platform.startswith("win"):
 import asyncio
 import json
 import re
-import tempfile
 import time
 import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from typing import Optional
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlparse
 from pathlib import Path
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from pydantic import BaseModel
-from starlette.responses import JSONResponse
+from starlette.responses import HTMLResponse, JSONResponse
 import httpx
+import aiofiles
+import orjson
+from selectolax.lexbor import LexborHTMLParser
 
 # Playwright imports (after proactor policy)
-from playwright.async_api import async_playwright
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
 
 # PDF parsing
-import pdfplumber
+import pymupdf
 import traceback
 import logging
 
@@ -46,14 +51,139 @@ SECRET = "PolireddyPalem"  # keep in sync with Google Form
 DEBUG_DIR = Path("debug_artifacts")
 DEBUG_DIR.mkdir(exist_ok=True)
 
-# make these configurable if you want
-TAKE_SCREENSHOTS = True
-SAVE_HTML = True
+# non-JSON responses and diagnostic text are truncated to this before decoding / writing last_submit.json
+MAX_RESPONSE_BYTES = 64 * 1024
+MAX_HEADER_VALUE_CHARS = 1024
+# per-step debug artifacts are opt-in: DEBUG_ARTIFACTS=1 saves HTML,
+# TAKE_SCREENSHOTS=1 additionally saves viewport screenshots
+DEBUG_ARTIFACTS = os.getenv("DEBUG_ARTIFACTS", "0") == "1"
+TAKE_SCREENSHOTS = DEBUG_ARTIFACTS and os.getenv("TAKE_SCREENSHOTS", "0") == "1"
+SAVE_HTML = DEBUG_ARTIFACTS
 USER_AGENT = "LLM-Quiz-Solver/1.0 (+https://github.com/yourname)"
+# max quizzes solved at once per worker (each holds a browser context); extra requests queue
+MAX_CONCURRENT_SOLVES = int(os.getenv("MAX_CONCURRENT_SOLVES", "2"))
+SOLVER_SEM = asyncio.Semaphore(MAX_CONCURRENT_SOLVES)
+# PROFILING=1 lets any request append ?profile=1 to get a pyinstrument HTML report instead
+PROFILING_ENABLED = os.getenv("PROFILING", "0") == "1"
+# resource types the solver never reads; aborted when screenshots are off
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font", "stylesheet"}
+
+# regexes used on every quiz step, compiled once
+_SECRET_KV = re.compile(r'["\']secret["\']\s*:\s*["\']([^"\']+)["\']', re.IGNORECASE)
+_SECRET_AFTER_WORD = re.compile(r'secret[^A-Za-z0-9]*([A-Za-z0-9_\-]{3,})', re.IGNORECASE)
+_QUOTED_TOKEN = re.compile(r'["\']([A-Za-z0-9_\-]{3,})["\']')
+_ALNUM_TOKEN = re.compile(r'\b([A-Za-z0-9]{4,})\b')
+_SUBMIT_URL = re.compile(r'https?://[\w./\-?=&%]+/submit[\w/\-?=&%]*')
+_ANY_URL = re.compile(r'https?://[\w./\-?=&%]+')
+_SUM_VALUE = re.compile(r'sum[^\d\n]*([0-9,]+(?:\.[0-9]+)?)', re.IGNORECASE)
+_BARE_NUMBER = re.compile(r'([0-9]{2,}[0-9,]*)')
+_HTML_TAG = re.compile(r'<[^>]+>')
+_SCRAPE = re.compile(r'\bScrape\s+([^\s\(\n\r]+)', re.IGNORECASE)
+_DEMO = re.compile(r'POST\s+this\s+JSON\s+to\s+(https?://[^\s\n\r]+)', re.IGNORECASE)
+_TRAILING_COMMA = re.compile(r',\s*([}\]])')
+_JSON_DECODER = json.JSONDecoder()
+
+
+class _NumericFilter(dict):
+    """str.translate table that keeps only 0-9, '.' and '-'; fills itself per codepoint."""
+
+    def __missing__(self, ordinal):
+        value = ordinal if chr(ordinal) in '0123456789.-' else None
+        self[ordinal] = value
+        return value
+
+
+NUM_KEEP = _NumericFilter()
 
 
 app = FastAPI()
 
+# shared HTTP client so sequential submits/downloads reuse pooled keep-alive connections
+HTTPX_CLIENT: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared AsyncClient, creating it lazily if startup has not run."""
+    global HTTPX_CLIENT
+    if HTTPX_CLIENT is None or HTTPX_CLIENT.is_closed:
+        HTTPX_CLIENT = httpx.AsyncClient(
+            timeout=60,
+            follow_redirects=False,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+        )
+    return HTTPX_CLIENT
+
+
+@app.on_event("startup")
+async def startup_http_client():
+    get_http_client()
+
+
+@app.on_event("shutdown")
+async def shutdown_http_client():
+    global HTTPX_CLIENT
+    if HTTPX_CLIENT is not None:
+        await HTTPX_CLIENT.aclose()
+        HTTPX_CLIENT = None
+
+
+# one long-lived Chromium per worker; each quiz only allocates its own context/page
+app.state.pw = None
+app.state.browser = None
+_browser_lock = asyncio.Lock()
+
+
+async def get_browser():
+    """Return the shared Chromium browser, (re)launching it if needed."""
+    async with _browser_lock:
+        browser = app.state.browser
+        if browser is not None and browser.is_connected():
+            return browser
+        if app.state.pw is None:
+            app.state.pw = await async_playwright().start()
+        app.state.browser = await app.state.pw.chromium.launch(headless=True)
+        return app.state.browser
+
+
+@app.on_event("startup")
+async def startup_browser():
+    try:
+        await get_browser()
+    except Exception as e:
+        # don't block startup; solve_quiz_url will retry the launch lazily
+        logger.error("Failed to launch browser at startup: %s", str(e))
+
+
+@app.on_event("shutdown")
+async def shutdown_browser():
+    if app.state.browser is not None:
+        try:
+            await app.state.browser.close()
+        except Exception:
+            pass
+        app.state.browser = None
+    if app.state.pw is not None:
+        await app.state.pw.stop()
+        app.state.pw = None
+
+
+async def profile_request(request: Request, call_next):
+    if not request.query_params.get("profile"):
+        return await call_next(request)
+    profiler = Profiler(async_mode="enabled")
+    profiler.start()
+    try:
+        await call_next(request)
+    finally:
+        profiler.stop()
+    return HTMLResponse(profiler.output_html())
+
+
+# only pay for the middleware (and the pyinstrument import) when profiling is on
+if PROFILING_ENABLED:
+    from pyinstrument import Profiler
+    app.middleware("http")(profile_request)
+
 
 class QuizRequest(BaseModel):
     email: str
@@ -71,13 +201,50 @@ async def write_last_submit(submit_url: str, payload: dict, resp_diag: dict):
             "response": resp_diag
         }
         p = DEBUG_DIR / "last_submit.json"
-        with open(p, "w", encoding="utf-8") as f:
-            json.dump(out, f, indent=2)
+        async with aiofiles.open(p, "w", encoding="utf-8") as f:
+            await f.write(orjson.dumps(out, option=orjson.OPT_INDENT_2, default=str).decode())
         logger.info("Wrote last submit diagnostic to %s", str(p))
     except Exception as e:
         logger.error("Failed to write last_submit.json: %s", str(e))
 
 
+async def request_capped(client: httpx.AsyncClient, method: str, url: str, **kwargs):
+    """
+    Send a request, reading at most MAX_RESPONSE_BYTES of the body unless the
+    response is JSON (which is read in full so it can be parsed).
+    Returns (response, body); the response is closed and only its status and headers are used.
+    """
+    chunks = []
+    size = 0
+    async with client.stream(method, url, **kwargs) as resp:
+        if "json" in resp.headers.get("content-type", "").lower():
+            return resp, await resp.aread()
+        async for chunk in resp.aiter_bytes():
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= MAX_RESPONSE_BYTES:
+                break
+    return resp, b"".join(chunks)[:MAX_RESPONSE_BYTES]
+
+
+def parse_json_response(resp: httpx.Response, body: bytes):
+    """Decode a JSON body with orjson; None if the response is not JSON."""
+    if "json" not in resp.headers.get("content-type", "").lower() and body.lstrip()[:1] not in (b"{", b"["):
+        return None
+    try:
+        return orjson.loads(body)
+    except orjson.JSONDecodeError:
+        return None
+
+
+def response_diag(resp: httpx.Response, body: bytes) -> dict:
+    return {
+        "status_code": resp.status_code,
+        "text": body[:MAX_RESPONSE_BYTES].decode(resp.encoding or "utf-8", errors="replace"),
+        "headers": {k: v[:MAX_HEADER_VALUE_CHARS] for k, v in resp.headers.items()},
+    }
+
+
 async def submit_with_fallback(submit_url: str, payload: dict, timeout: int = 60) -> dict:
     """
     Try POSTing JSON to submit_url. If 405, try GET with query params.
@@ -86,214 +253,377 @@ async def submit_with_fallback(submit_url: str, payload: dict, timeout: int = 60
     """
     logger.info("Submitting to %s payload=%s", submit_url, payload)
     headers = {"Content-Type": "application/json", "Accept": "application/json", "User-Agent": USER_AGENT}
-    async with httpx.AsyncClient(timeout=timeout, follow_redirects=False) as client:
-        # Try POST first
+    client = get_http_client()
+    # Try POST first
+    try:
+        resp, body = await request_capped(client, "POST", submit_url, json=payload, headers=headers, timeout=timeout)
+    except Exception as e:
+        diag = {"status_code": None, "text": str(e), "headers": {}}
+        await write_last_submit(submit_url, payload, diag)
+        logger.error("POST to %s failed: %s", submit_url, str(e))
+        return diag
+
+    logger.info("POST %s -> %s", submit_url, resp.status_code)
+    # Try parse JSON
+    parsed = parse_json_response(resp, body)
+    if parsed is not None:
+        await write_last_submit(submit_url, payload, parsed)
+        return parsed
+
+    # Not JSON. Collect diagnostics (decode the body once).
+    resp_diag = response_diag(resp, body)
+    text = resp_diag["text"]
+    headers_resp = resp_diag["headers"]
+
+    # If status 405, try GET with params
+    if resp.status_code == 405:
+        logger.warning("POST returned 405; trying GET fallback for %s", submit_url)
         try:
-            resp = await client.post(submit_url, json=payload, headers=headers)
-        except Exception as e:
-            diag = {"status_code": None, "text": str(e), "headers": {}}
+            resp2, body2 = await request_capped(client, "GET", submit_url, params=payload, headers={"User-Agent": USER_AGENT}, timeout=timeout)
+        except Exception as e2:
+            diag = {"status_code": None, "text": str(e2), "headers": headers_resp}
             await write_last_submit(submit_url, payload, diag)
-            logger.error("POST to %s failed: %s", submit_url, str(e))
+            logger.error("GET fallback to %s failed: %s", submit_url, str(e2))
             return diag
-
-        logger.info("POST %s -> %s", submit_url, resp.status_code)
-        # Try parse JSON
+        logger.info("GET %s -> %s", submit_url, resp2.status_code)
+        parsed2 = parse_json_response(resp2, body2)
+        if parsed2 is None:
+            parsed2 = response_diag(resp2, body2)
+        await write_last_submit(submit_url, payload, parsed2)
+        return parsed2
+
+    # If 200 with empty body, try follow Location header or do GET
+    if resp.status_code == 200 and (not text.strip()):
+        loc = resp.headers.get("location")
+        if loc:
+            logger.info("Following Location header: %s", loc)
+            try:
+                next_url = urljoin(submit_url, loc)
+                resp3, body3 = await request_capped(client, "GET", next_url, headers={"User-Agent": USER_AGENT}, timeout=timeout)
+            except Exception as e3:
+                await write_last_submit(submit_url, payload, resp_diag)
+                logger.error("Following Location failed: %s", str(e3))
+                return resp_diag
+            parsed3 = parse_json_response(resp3, body3)
+            if parsed3 is None:
+                parsed3 = response_diag(resp3, body3)
+            await write_last_submit(submit_url, payload, parsed3)
+            return parsed3
+
+        # Try GET on submit_url
+        logger.info("POST returned 200 with empty body; trying GET on %s", submit_url)
         try:
-            parsed = resp.json()
-            await write_last_submit(submit_url, payload, parsed)
-            return parsed
-        except Exception:
-            # Not JSON. Collect diagnostics.
-            text = resp.text or ""
-            headers_resp = dict(resp.headers or {})
-
-            # If status 405, try GET with params
-            if resp.status_code == 405:
-                logger.warning("POST returned 405; trying GET fallback for %s", submit_url)
-                try:
-                    resp2 = await client.get(submit_url, params=payload, headers={"User-Agent": USER_AGENT})
-                    logger.info("GET %s -> %s", submit_url, resp2.status_code)
-                    try:
-                        parsed2 = resp2.json()
-                        await write_last_submit(submit_url, payload, parsed2)
-                        return parsed2
-                    except Exception:
-                        diag = {"status_code": resp2.status_code, "text": resp2.text, "headers": dict(resp2.headers or {})}
-                        await write_last_submit(submit_url, payload, diag)
-                        return diag
-                except Exception as e2:
-                    diag = {"status_code": None, "text": str(e2), "headers": headers_resp}
-                    await write_last_submit(submit_url, payload, diag)
-                    logger.error("GET fallback to %s failed: %s", submit_url, str(e2))
-                    return diag
-
-            # If 200 with empty body, try follow Location header or do GET
-            if resp.status_code == 200 and (not text.strip()):
-                loc = headers_resp.get("Location") or headers_resp.get("location")
-                if loc:
-                    logger.info("Following Location header: %s", loc)
-                    try:
-                        next_url = urljoin(submit_url, loc)
-                        resp3 = await client.get(next_url, headers={"User-Agent": USER_AGENT})
-                        try:
-                            parsed3 = resp3.json()
-                            await write_last_submit(submit_url, payload, parsed3)
-                            return parsed3
-                        except Exception:
-                            diag = {"status_code": resp3.status_code, "text": resp3.text, "headers": dict(resp3.headers or {})}
-                            await write_last_submit(submit_url, payload, diag)
-                            return diag
-                    except Exception as e3:
-                        diag = {"status_code": resp.status_code, "text": text, "headers": headers_resp}
-                        await write_last_submit(submit_url, payload, diag)
-                        logger.error("Following Location failed: %s", str(e3))
-                        return diag
-
-                # Try GET on submit_url
-                logger.info("POST returned 200 with empty body; trying GET on %s", submit_url)
-                try:
-                    resp4 = await client.get(submit_url, params=payload, headers={"User-Agent": USER_AGENT})
-                    try:
-                        parsed4 = resp4.json()
-                        await write_last_submit(submit_url, payload, parsed4)
-                        return parsed4
-                    except Exception:
-                        diag = {"status_code": resp4.status_code, "text": resp4.text, "headers": dict(resp4.headers or {})}
-                        await write_last_submit(submit_url, payload, diag)
-                        return diag
-                except Exception as e4:
-                    diag = {"status_code": resp.status_code, "text": text, "headers": headers_resp}
-                    await write_last_submit(submit_url, payload, diag)
-                    logger.error("GET attempt after empty POST failed: %s", str(e4))
-                    return diag
-
-            # otherwise return diagnostic
-            diag = {"status_code": resp.status_code, "text": text, "headers": headers_resp}
-            await write_last_submit(submit_url, payload, diag)
-            return diag
+            resp4, body4 = await request_capped(client, "GET", submit_url, params=payload, headers={"User-Agent": USER_AGENT}, timeout=timeout)
+        except Exception as e4:
+            await write_last_submit(submit_url, payload, resp_diag)
+            logger.error("GET attempt after empty POST failed: %s", str(e4))
+            return resp_diag
+        parsed4 = parse_json_response(resp4, body4)
+        if parsed4 is None:
+            parsed4 = response_diag(resp4, body4)
+        await write_last_submit(submit_url, payload, parsed4)
+        return parsed4
+
+    # otherwise return diagnostic
+    await write_last_submit(submit_url, payload, resp_diag)
+    return resp_diag
 
 
 def extract_secret_from_text(text: str) -> Optional[str]:
     """
     Heuristic extractor for a 'secret code' from page text.
     """
-    m = re.search(r'["\']secret["\']\s*:\s*["\']([^"\']+)["\']', text, re.IGNORECASE)
+    m = _SECRET_KV.search(text)
     if m:
         return m.group(1).strip()
-    m = re.search(r'secret[^A-Za-z0-9]*([A-Za-z0-9_\-]{3,})', text, re.IGNORECASE)
+    m = _SECRET_AFTER_WORD.search(text)
     if m:
         return m.group(1).strip()
-    m = re.search(r'["\']([A-Za-z0-9_\-]{3,})["\']', text)
+    m = _QUOTED_TOKEN.search(text)
     if m:
         return m.group(1).strip()
-    m = re.search(r'\b([A-Za-z0-9]{4,})\b', text)
+    m = _ALNUM_TOKEN.search(text)
     if m:
         return m.group(1).strip()
     return None
 
 
-def find_submit_url(html: str) -> Optional[str]:
-    m = re.search(r'https?://[\w./\-?=&%]+/submit[\w/\-?=&%]*', html)
+def find_submit_url(html: str, tree: LexborHTMLParser, base_url: str = '') -> Optional[str]:
+    form = tree.css_first('form[action*="/submit"]')
+    if form is not None:
+        return urljoin(base_url, form.attributes.get('action') or '')
+    m = _SUBMIT_URL.search(html)
     if m:
         return m.group(0)
-    m2 = re.search(r'https?://[\w./\-?=&%]+', html)
+    m2 = _ANY_URL.search(html)
     if m2:
         return m2.group(0)
     return None
 
 
-def find_pdf_link(html: str, base_url: str = '') -> Optional[str]:
-    m = re.search(r'href=["\']([^"\']+\.pdf)["\']', html, re.IGNORECASE)
-    if m:
-        link = m.group(1)
-        if link.startswith('http'):
-            return link
-        if base_url.endswith('/'):
-            return base_url.rstrip('/') + '/' + link.lstrip('/')
-        return base_url + link
-    return None
+def find_pdf_link(tree: LexborHTMLParser, base_url: str = '') -> Optional[str]:
+    # selectolax decodes entities (e.g. &amp;) in attribute values
+    node = tree.css_first('a[href$=".pdf" i]')
+    return urljoin(base_url, node.attributes['href']) if node is not None else None
 
 
 async def download_bytes(url: str) -> bytes:
     try:
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            r = await client.get(url)
-            r.raise_for_status()
-            return r.content
+        r = await get_http_client().get(url, timeout=120.0)
+        r.raise_for_status()
+        return r.content
     except Exception as e:
         logger.error("download_bytes failed for %s: %s", url, str(e))
         raise
 
 
-def parse_pdf_sum(path: str) -> Optional[float]:
+def parse_pdf_sum(data: bytes) -> Optional[float]:
     try:
-        with pdfplumber.open(path) as pdf:
-            if len(pdf.pages) >= 2:
-                page = pdf.pages[1]
-            else:
-                page = pdf.pages[0]
-            tables = page.extract_tables()
-            if tables:
-                tbl = tables[0]
-                headers = [c.strip().lower() if c else '' for c in tbl[0]]
-                col_idx = None
-                for i, h in enumerate(headers):
-                    if 'value' in h:
-                        col_idx = i
-                        break
-                if col_idx is None:
-                    col_idx = len(headers) - 1
-                s = 0.0
-                for row in tbl[1:]:
-                    cell = row[col_idx]
-                    if cell is None:
-                        continue
-                    num = re.sub(r'[^0-9.-]', '', cell)
-                    try:
-                        s += float(num)
-                    except Exception:
-                        continue
-                return s
+        doc = pymupdf.open(stream=data, filetype="pdf")
+    except Exception:
+        return None
+    try:
+        if doc.page_count >= 2:
+            page = doc[1]
+        else:
+            page = doc[0]
+        tables = page.find_tables().tables
+        if tables:
+            tbl = tables[0].extract()
+            headers = [c.strip().lower() if c else '' for c in tbl[0]]
+            col_idx = None
+            for i, h in enumerate(headers):
+                if 'value' in h:
+                    col_idx = i
+                    break
+            if col_idx is None:
+                col_idx = len(headers) - 1
+            s = 0.0
+            for row in tbl[1:]:
+                cell = row[col_idx]
+                if cell is None:
+                    continue
+                num = cell.translate(NUM_KEEP)
+                try:
+                    s += float(num)
+                except ValueError:
+                    continue
+            return s
     except Exception:
         return None
+    finally:
+        doc.close()
     return None
 
 
 def extract_numeric_answer_from_text(text: str) -> Optional[float]:
-    m = re.search(r'sum[^\d\n]*([0-9,]+(?:\.[0-9]+)?)', text, re.IGNORECASE)
+    m = _SUM_VALUE.search(text)
     if m:
         try:
             return float(m.group(1).replace(',', ''))
-        except:
+        except ValueError:
             pass
-    m2 = re.search(r'([0-9]{2,}[0-9,]*)', text)
+    m2 = _BARE_NUMBER.search(text)
     if m2:
         try:
             return float(m2.group(1).replace(',', ''))
-        except:
+        except ValueError:
             pass
     return None
 
 
-async def save_debug_step(step_index: int, page, content_html: str):
-    """Save screenshot and HTML for the debugging step."""
+# CPU-bound PDF parsing runs in worker processes so the event loop stays responsive.
+# Uses "spawn": forking a uvicorn worker that already runs threads and a Playwright
+# driver connection is unsafe. Kept small since every uvicorn worker has one, and
+# warmed at startup so the first PDF step doesn't pay the interpreter + import cost.
+PDF_POOL_WORKERS = int(os.getenv("PDF_POOL_WORKERS", "1"))
+_pdf_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_pdf_pool() -> ProcessPoolExecutor:
+    global _pdf_pool
+    if _pdf_pool is None:
+        _pdf_pool = ProcessPoolExecutor(
+            max_workers=PDF_POOL_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pdf_pool
+
+
+async def parse_pdf_sum_in_pool(data: bytes) -> Optional[float]:
+    """Run parse_pdf_sum in the pool, recreating the pool once if a worker died."""
+    global _pdf_pool
+    loop = asyncio.get_running_loop()
+    for _ in range(2):
+        pool = get_pdf_pool()
+        try:
+            return await loop.run_in_executor(pool, parse_pdf_sum, data)
+        except BrokenProcessPool:
+            logger.error("PDF worker process died; recreating pool")
+            # another request may already have replaced it
+            if _pdf_pool is pool:
+                _pdf_pool = None
+            pool.shutdown(wait=False, cancel_futures=True)
+    return None
+
+
+def _warm_pdf_worker():
+    return None
+
+
+@app.on_event("startup")
+async def startup_pdf_pool():
+    # fire-and-forget: the worker imports in the background without delaying startup
+    get_pdf_pool().submit(_warm_pdf_worker)
+
+
+@app.on_event("shutdown")
+async def shutdown_pdf_pool():
+    global _pdf_pool
+    if _pdf_pool is not None:
+        _pdf_pool.shutdown(wait=False, cancel_futures=True)
+        _pdf_pool = None
+
+
+# strong refs to fire-and-forget tasks so they aren't garbage-collected mid-flight
+_BACKGROUND_TASKS = set()
+
+
+async def write_debug_artifacts(step_index: int, png: Optional[bytes], content_html: str):
+    """Write a step's screenshot and HTML to DEBUG_DIR."""
     try:
-        if TAKE_SCREENSHOTS:
+        if png is not None:
             path = DEBUG_DIR / f"dbg_step_{step_index}.png"
-            await page.screenshot(path=str(path), full_page=True)
+            async with aiofiles.open(path, "wb") as fh:
+                await fh.write(png)
             logger.info("Saved screenshot %s", path)
         if SAVE_HTML:
             html_path = DEBUG_DIR / f"dbg_step_{step_index}.html"
-            with open(html_path, "w", encoding="utf-8") as fh:
-                fh.write(content_html)
+            async with aiofiles.open(html_path, "w", encoding="utf-8") as fh:
+                await fh.write(content_html)
             logger.info("Saved HTML %s", html_path)
     except Exception as e:
         logger.error("Failed saving debug artifacts: %s", str(e))
 
 
+async def save_debug_step(step_index: int, page, content_html: str):
+    """
+    Save screenshot and HTML for the debugging step.
+    The screenshot is captured before returning (the page is about to navigate);
+    disk writes run in the background off the solver's critical path.
+    """
+    if not (TAKE_SCREENSHOTS or SAVE_HTML):
+        return
+    png = None
+    if TAKE_SCREENSHOTS and page is not None:
+        try:
+            png = await page.screenshot(full_page=False)
+        except Exception as e:
+            logger.error("Failed taking screenshot: %s", str(e))
+    task = asyncio.create_task(write_debug_artifacts(step_index, png, content_html))
+    _BACKGROUND_TASKS.add(task)
+    task.add_done_callback(_BACKGROUND_TASKS.discard)
+
+
+async def block_static_resources(route):
+    """Abort requests for visual assets; let everything else through."""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def goto_and_settle(page, url: str):
+    """
+    Navigate and return as soon as the page is usable: DOM loaded and either fully
+    loaded or the body has content. No fixed sleeps, no networkidle.
+    """
+    await page.goto(url, wait_until='domcontentloaded', timeout=30000)
+    try:
+        await page.wait_for_function(
+            "document.readyState === 'complete' || !!document.querySelector('body > *')",
+            timeout=5000,
+        )
+    except PlaywrightTimeoutError:
+        logger.warning("Page %s not settled after 5s; reading it anyway", url)
+
+
+async def read_page(page) -> tuple:
+    """
+    Return (html, text) for the current page, fetching each exactly once.
+    Both are independent CDP round-trips, so they run concurrently; text falls
+    back to tag-stripped HTML if inner_text fails.
+    """
+    html, text = await asyncio.gather(page.content(), page.inner_text('body'), return_exceptions=True)
+    if isinstance(html, BaseException):
+        raise html
+    if isinstance(text, BaseException):
+        text = _HTML_TAG.sub(' ', html)
+    return html, text
+
+
+def has_quiz_instructions(tree: LexborHTMLParser, text: str) -> bool:
+    return bool(_SCRAPE.search(text) or _DEMO.search(text) or find_pdf_link(tree))
+
+
+# hosts that have served a page needing the browser; later steps skip the preflight GET
+_BROWSER_HOSTS = set()
+
+
+def page_text_from_tree(tree: LexborHTMLParser) -> str:
+    """Visible-ish text of static HTML: drops head/script/style (in place) before extracting."""
+    tree.strip_tags(['head', 'script', 'style', 'noscript', 'template'])
+    root = tree.body or tree.root
+    return root.text(separator=' ') if root is not None else ''
+
+
+async def fetch_static_page(url: str) -> Optional[tuple]:
+    """
+    Plain GET of a quiz page. Returns (html, text, tree) when the served HTML already
+    carries the instructions, or None when the page needs a JS-rendered browser.
+    """
+    host = urlparse(url).netloc
+    if host in _BROWSER_HOSTS:
+        return None
+    try:
+        r, body = await request_capped(get_http_client(), "GET", url, headers={"User-Agent": USER_AGENT}, timeout=30.0)
+    except Exception as e:
+        logger.info("Static fetch of %s failed, using browser: %s", url, str(e))
+        return None
+    if r.status_code != 200 or "html" not in r.headers.get("content-type", "").lower():
+        return None
+    html = body.decode(r.encoding or "utf-8", errors="replace")
+    # scripted pages may rewrite the DOM; only the rendered text is trustworthy there.
+    # Oversized pages were truncated by the cap, so they go to the browser too.
+    if len(body) >= MAX_RESPONSE_BYTES or "<script" in html.lower():
+        _BROWSER_HOSTS.add(host)
+        return None
+    tree = LexborHTMLParser(html)
+    text = page_text_from_tree(tree)
+    if not has_quiz_instructions(tree, text):
+        _BROWSER_HOSTS.add(host)
+        return None
+    logger.info("Using static HTML for %s", url)
+    return html, text, tree
+
+
+async def new_browser_page():
+    """Open a fresh context + page on the shared browser."""
+    browser = await get_browser()
+    context = await browser.new_context(user_agent=USER_AGENT)
+    try:
+        if not TAKE_SCREENSHOTS:
+            await context.route("**/*", block_static_resources)
+        page = await context.new_page()
+    except Exception:
+        await context.close()
+        raise
+    return context, page
+
+
 async def solve_quiz_url(initial_url: str, original_payload: dict) -> dict:
     """
-    Chain-following solver with debug artifact saving enabled.
+    Chain-following solver. Saves per-step debug artifacts when DEBUG_ARTIFACTS=1.
     """
     timeout_seconds = 180.0
     start_time = time.time()
@@ -301,63 +631,56 @@ async def solve_quiz_url(initial_url: str, original_payload: dict) -> dict:
     last_response = {"correct": False, "reason": "No attempts made"}
     step_index = 0
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        context = await browser.new_context()
-        page = await context.new_page()
-        # set UA for page requests
-        try:
-            await page.set_extra_http_headers({"User-Agent": USER_AGENT})
-        except Exception:
-            pass
-
+    # the browser context is only created once a step actually needs rendering
+    context = None
+    page = None
+    try:
         while True:
             if time.time() - start_time > timeout_seconds:
-                await browser.close()
                 return {"correct": False, "reason": "Timeout exceeded (3 minutes)", "last_response": last_response}
 
             step_index += 1
-            await page.goto(current_url, wait_until='networkidle', timeout=60000)
-            await asyncio.sleep(1)
-            content_html = await page.content()
-            try:
-                content_text = await page.inner_text('body')
-            except Exception:
-                content_text = re.sub(r'<[^>]+>', ' ', content_html)
+            static_page = await fetch_static_page(current_url)
+            if static_page is not None:
+                content_html, content_text, tree = static_page
+            else:
+                # parsed lazily: only the scrape and fallback branches need it
+                tree = None
+                if page is None:
+                    context, page = await new_browser_page()
+                await goto_and_settle(page, current_url)
+                content_html, content_text = await read_page(page)
 
-            # save debug artifacts
-            await save_debug_step(step_index, page, content_html)
+            # save debug artifacts (no screenshot for statically fetched steps)
+            await save_debug_step(step_index, None if static_page is not None else page, content_html)
 
             # ----- Scrape instruction handling -----
-            scrape_match = re.search(r'\bScrape\s+([^\s\(\n\r]+)', content_text, re.IGNORECASE)
+            scrape_match = _SCRAPE.search(content_text)
             if scrape_match:
                 scrape_path = scrape_match.group(1).strip()
                 scrape_url = urljoin(current_url, scrape_path)
                 try:
-                    await page.goto(scrape_url, wait_until='networkidle', timeout=60000)
-                    await asyncio.sleep(0.5)
-                    try:
-                        scrape_text = await page.inner_text('body')
-                    except Exception:
-                        scrape_text = await page.content()
+                    if page is None:
+                        context, page = await new_browser_page()
+                    await goto_and_settle(page, scrape_url)
+                    scrape_html, scrape_text = await read_page(page)
                     # save step for scrape page
-                    await save_debug_step(step_index + 1000, page, await page.content())
+                    await save_debug_step(step_index + 1000, page, scrape_html)
                 except Exception:
                     try:
-                        async with httpx.AsyncClient(timeout=30.0) as client:
-                            r = await client.get(scrape_url, headers={"User-Agent": USER_AGENT})
-                            r.raise_for_status()
-                            scrape_text = r.text
+                        r = await get_http_client().get(scrape_url, headers={"User-Agent": USER_AGENT}, timeout=30.0)
+                        r.raise_for_status()
+                        scrape_text = r.text
                     except Exception as e:
-                        await browser.close()
                         return {"correct": False, "reason": "Failed to fetch scrape URL", "scrape_url": scrape_url, "error": str(e)}
 
                 secret_code = extract_secret_from_text(scrape_text)
                 if not secret_code:
-                    await browser.close()
                     return {"correct": False, "reason": "Could not find secret on scrape page", "scrape_url": scrape_url, "page_snippet": scrape_text[:800]}
 
-                submit_url = find_submit_url(content_html) or urljoin(current_url, "/submit")
+                if tree is None:
+                    tree = LexborHTMLParser(content_html)
+                submit_url = find_submit_url(content_html, tree, base_url=current_url) or urljoin(current_url, "/submit")
                 submit_payload = {
                     "email": original_payload.get("email"),
                     "secret": original_payload.get("secret"),
@@ -372,37 +695,24 @@ async def solve_quiz_url(initial_url: str, original_payload: dict) -> dict:
                     current_url = urljoin(current_url, next_url)
                     continue
                 else:
-                    await browser.close()
                     return last_response
 
             # ----- demo pattern: POST this JSON to <url> -----
-            demo_match = re.search(r'POST\s+this\s+JSON\s+to\s+(https?://[^\s\n\r]+)', content_text, re.IGNORECASE)
+            demo_match = _DEMO.search(content_text)
             if demo_match:
                 submit_url = demo_match.group(1).strip()
                 start_pos = content_text.find('{', demo_match.end())
                 json_payload = {}
                 if start_pos != -1:
-                    depth = 0
-                    end_pos = -1
-                    for i in range(start_pos, len(content_text)):
-                        ch = content_text[i]
-                        if ch == '{':
-                            depth += 1
-                        elif ch == '}':
-                            depth -= 1
-                            if depth == 0:
-                                end_pos = i
-                                break
-                    if end_pos != -1:
-                        raw_json = content_text[start_pos:end_pos+1]
+                    # raw_decode does the brace matching in C and stops at the object's end
+                    try:
+                        json_payload, _ = _JSON_DECODER.raw_decode(content_text, start_pos)
+                    except ValueError:
                         try:
-                            json_payload = json.loads(raw_json)
-                        except Exception:
-                            try:
-                                cleaned = re.sub(r',\s*([}\]])', r'\1', raw_json)
-                                json_payload = json.loads(cleaned)
-                            except Exception:
-                                json_payload = {}
+                            cleaned = _TRAILING_COMMA.sub(r'\1', content_text[start_pos:])
+                            json_payload, _ = _JSON_DECODER.raw_decode(cleaned)
+                        except ValueError:
+                            json_payload = {}
 
                 json_payload.setdefault("email", original_payload.get("email"))
                 json_payload.setdefault("secret", original_payload.get("secret"))
@@ -416,24 +726,20 @@ async def solve_quiz_url(initial_url: str, original_payload: dict) -> dict:
                     current_url = urljoin(current_url, next_url)
                     continue
                 else:
-                    await browser.close()
                     return last_response
 
             # ----- fallback: PDF / numeric / generic submit -----
-            submit_url = find_submit_url(content_html)
-            pdf_link = find_pdf_link(content_html, base_url=current_url)
+            if tree is None:
+                tree = LexborHTMLParser(content_html)
+            submit_url = find_submit_url(content_html, tree, base_url=current_url)
+            pdf_link = find_pdf_link(tree, base_url=current_url)
             if pdf_link:
-                with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as f:
-                    pdf_bytes = await download_bytes(pdf_link)
-                    f.write(pdf_bytes)
-                    f.flush()
-                    fpath = f.name
-                result = parse_pdf_sum(fpath)
+                pdf_bytes = await download_bytes(pdf_link)
+                result = await parse_pdf_sum_in_pool(pdf_bytes)
                 answer = result
             else:
                 answer = extract_numeric_answer_from_text(content_text)
                 if answer is None:
-                    await browser.close()
                     return {"correct": False, "reason": "Could not auto-solve", "page_text_snippet": content_text[:1200], "last_response": last_response}
 
             submit_payload = {
@@ -444,7 +750,6 @@ async def solve_quiz_url(initial_url: str, original_payload: dict) -> dict:
             }
 
             if not submit_url:
-                await browser.close()
                 return {"correct": False, "reason": "No submit URL found", "attempted_answer": submit_payload, "last_response": last_response}
 
             resp_json = await submit_with_fallback(submit_url, submit_payload)
@@ -454,8 +759,10 @@ async def solve_quiz_url(initial_url: str, original_payload: dict) -> dict:
                 current_url = urljoin(current_url, next_url)
                 continue
             else:
-                await browser.close()
                 return last_response
+    finally:
+        if context is not None:
+            await context.close()
 
 
 @app.post("/api/quiz")
@@ -477,7 +784,8 @@ async def handle_quiz(payload: QuizRequest):
         })
 
     try:
-        answer_payload = await solve_quiz_url(url, data)
+        async with SOLVER_SEM:
+            answer_payload = await solve_quiz_url(url, data)
         return JSONResponse(status_code=200, content=answer_payload)
     except Exception:
         tb = traceback.format_exc()